@@ -1,7 +1,19 @@
 import os
-import glob
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import numpy as np
 from PIL import Image
 
+# Size of the diamond every sprite morphs into
+DIAMOND_WIDTH = 8
+DIAMOND_HEIGHT = 14
+
+# Output frames are two-color palette images: transparent background, white sprite
+TRANSPARENT_INDEX = 0
+WHITE_INDEX = 1
+SILHOUETTE_PALETTE = [0, 0, 0, 255, 255, 255]
+
 def process_gif_folder(input_folder, output_folder):
     """
     Process all GIFs in a folder according to specifications:
@@ -14,7 +26,11 @@ def process_gif_folder(input_folder, output_folder):
     os.makedirs(output_folder, exist_ok=True)
     
     # Find all GIF files in the input folder
-    gif_files = glob.glob(os.path.join(input_folder, "*.gif"))
+    with os.scandir(input_folder) as entries:
+        gif_files = [
+            entry.path for entry in entries
+            if entry.name.endswith(".gif") and not entry.name.startswith(".") and entry.is_file()
+        ]
     
     if not gif_files:
         print(f"No GIF files found in {input_folder}")
@@ -22,11 +38,16 @@ def process_gif_folder(input_folder, output_folder):
     
     print(f"Found {len(gif_files)} GIF files to process")
     
-    for gif_path in gif_files:
-        try:
-            process_single_gif(gif_path, output_folder)
-        except Exception as e:
-            print(f"Error processing {os.path.basename(gif_path)}: {e}")
+    # Each GIF is independent, so fan them out across processes
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(partial(try_process_single_gif, output_folder=output_folder), gif_files, chunksize=4))
+
+def try_process_single_gif(gif_path, output_folder):
+    """Process a single GIF file, reporting (not raising) any error"""
+    try:
+        process_single_gif(gif_path, output_folder)
+    except Exception as e:
+        print(f"Error processing {os.path.basename(gif_path)}: {e}")
 
 def process_single_gif(gif_path, output_folder):
     """Process a single GIF file"""
@@ -70,7 +91,9 @@ def process_single_gif(gif_path, output_folder):
             append_images=animation_frames,
             duration=100,  # 100ms per frame for smooth animation
             loop=0,  # Infinite loop
-            disposal=2
+            disposal=2,
+            transparency=TRANSPARENT_INDEX,
+            optimize=False  # Frames are already two-color palette images
         )
 
         # Save backward animation (switch in: circle -> initial frame)
@@ -82,154 +105,149 @@ def process_single_gif(gif_path, output_folder):
             append_images=reversed_frames[1:] + [frame1],
             duration=100,  # 100ms per frame for smooth animation
             loop=0,  # Infinite loop
-            disposal=2
+            disposal=2,
+            transparency=TRANSPARENT_INDEX,
+            optimize=False  # Frames are already two-color palette images
         )
 
 def create_white_frame(original_frame):
     """Convert frame to white pixels with transparent background"""
 
-    # Create a new RGBA image with transparent background
-    width, height = original_frame.size
-    white_frame = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-
-    # Get pixel data
-    original_data = original_frame.getdata()
-    new_data = []
-
-    for pixel in original_data:
-        # If pixel has alpha channel
-        if len(pixel) == 4:
-            a = pixel[3]  # Only need alpha channel
-            # Keep transparent pixels transparent, make all others white
-            if a == 0:  # Fully transparent
-                new_data.append((0, 0, 0, 0))  # Keep transparent
-            else:
-                new_data.append((255, 255, 255, 255))  # Make white, opaque
-        else:  # RGB mode - assume all GIFs have transparency, so convert to RGBA
-            # All non-transparent pixels become white
-            new_data.append((255, 255, 255, 255))  # White, opaque
-            
-    white_frame.putdata(new_data)
-    return white_frame
-
-def create_morphing_animation(start_frame, width, height, num_frames):
-    """Create a morphing animation that moves and deforms pixels to final diamond"""
-    import math
-    import random
-
-    frames = []
+    # Get pixel data as an (height, width, channels) array
+    original_data = np.asarray(original_frame)
+
+    if original_frame.mode == 'RGBA':
+        # Keep transparent pixels transparent, make all others white
+        mask = original_data[..., 3] > 0
+    else:  # RGB mode - assume all GIFs have transparency, so convert to RGBA
+        # All non-transparent pixels become white
+        mask = np.ones(original_data.shape[:2], dtype=bool)
+
+    return create_silhouette_frame(mask.astype(np.uint8) * WHITE_INDEX)
+
+def create_silhouette_frame(indices):
+    """Wrap a (height, width) uint8 array of palette indices as a transparent-background palette frame"""
+    frame = Image.fromarray(indices)
+    frame.putpalette(SILHOUETTE_PALETTE)
+    frame.info['transparency'] = TRANSPARENT_INDEX
+    return frame
+
+def create_diamond_mask(width, height, center_x, center_y, half_width, half_height):
+    """Boolean (height, width) mask of pixels inside a diamond centered on (center_x, center_y)"""
+    ys, xs = np.ogrid[:height, :width]
+    dx = np.abs(xs - center_x)
+    dy = np.abs(ys - center_y)
+
+    # Diamond shape: |x|/half_width + |y|/half_height <= 1
+    return dx / half_width + dy / half_height <= 1.0
+
+def render_morph_frames(start, target, control, survives, visible_counts,
+                        eased_progress, deform_strength, progress, center_x, center_y, out):
+    """Draw every morph frame for every pixel at once into out, a (frames, height, width) palette index buffer"""
+    height, width = out.shape[1:]
+
+    # Bezier weights are per-frame constants, computed once and broadcast as (frames, 1)
+    t = eased_progress[:, None]
+    start_weight = (1-t)**2
+    control_weight = 2*(1-t)*t
+    target_weight = t**2
+
+    # Quadratic bezier curve for smooth movement
+    current_x = start_weight * start[:, 0] + control_weight * control[:, 0] + target_weight * target[:, 0]
+    current_y = start_weight * start[:, 1] + control_weight * control[:, 1] + target_weight * target[:, 1]
+
+    # Add deformation (stretching/squeezing effect)
+    dx_to_center = current_x - center_x
+    dy_to_center = current_y - center_y
+    distance_sq = dx_to_center**2 + dy_to_center**2
+
+    # Reciprocal distance to center; pixels exactly at the center (dx = dy = 0) get 0 and stay put
+    inverse_distance = np.divide(1.0, np.sqrt(distance_sq), out=np.zeros_like(distance_sq), where=distance_sq > 0)
+
+    # Add radial deformation
+    radial = (deform_strength * np.sin(progress * 2 * np.pi))[:, None]
+    deform_factor = 1 + radial * inverse_distance
+    current_x = center_x + dx_to_center * deform_factor
+    current_y = center_y + dy_to_center * deform_factor
+
+    # Round to pixel coordinates
+    pixel_x = np.rint(current_x).astype(np.intp)
+    pixel_y = np.rint(current_y).astype(np.intp)
+
+    # Check if pixel should be visible
+    should_survive = survives | (np.arange(len(survives)) < visible_counts[:, None])
+    active = should_survive & (pixel_x >= 0) & (pixel_x < width) & (pixel_y >= 0) & (pixel_y < height)
+
+    # Draw pixels (handle overlaps by just overwriting)
+    frame_idx, pixel_idx = np.nonzero(active)
+    out[frame_idx, pixel_y[frame_idx, pixel_idx], pixel_x[frame_idx, pixel_idx]] = WHITE_INDEX
+
+@lru_cache(maxsize=None)
+def get_final_diamond_pixels(width, height):
+    """(x, y) pixels of the centered final diamond in row-major order, computed once per canvas size"""
+    diamond_ys, diamond_xs = np.nonzero(create_diamond_mask(
+        width, height, width // 2, height // 2, DIAMOND_WIDTH / 2.0, DIAMOND_HEIGHT / 2.0
+    ))
+    pixels = np.stack([diamond_xs, diamond_ys], axis=1)
+    pixels.flags.writeable = False  # Shared between calls
+    return pixels
+
+def create_morphing_animation(start_frame, width, height, num_frames, rng=None):
+    """Create a morphing animation that moves and deforms pixels to final diamond
+
+    start_frame is a silhouette palette frame as returned by create_white_frame.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
     center_x = width // 2
     center_y = height // 2
-    diamond_width = 8
-    diamond_height = 14
 
-    # Get all white pixels from the start frame
-    start_pixels = start_frame.load()
-    white_pixels = []
+    # Get all white (non-transparent) pixels from the start frame (row-major order)
+    white_ys, white_xs = np.nonzero(np.asarray(start_frame) == WHITE_INDEX)
+
+    # Final diamond pixels (row-major order)
+    final_diamond_pixels = get_final_diamond_pixels(width, height)
 
-    for y in range(height):
-        for x in range(width):
-            if start_pixels[x, y][3] > 0:  # If pixel is not transparent
-                white_pixels.append((x, y))
+    total_start_pixels = len(white_xs)
+    total_final_pixels = len(final_diamond_pixels)
 
-    # Calculate final diamond pixels
-    final_diamond_pixels = []
-    half_width = diamond_width / 2.0
-    half_height = diamond_height / 2.0
+    # Per-pixel state as parallel arrays, one row per starting pixel
+    start = np.stack([white_xs, white_ys], axis=1).astype(np.float64)
+    survives = np.arange(total_start_pixels) < total_final_pixels
 
-    for y in range(height):
-        for x in range(width):
-            dx = abs(x - center_x)
-            dy = abs(y - center_y)
+    # Assign target position in final diamond (some pixels won't have targets)
+    target = np.empty_like(start)
+    matched = min(total_start_pixels, total_final_pixels)
+    target[:matched] = final_diamond_pixels[:matched]
 
-            # Diamond shape: |x|/half_width + |y|/half_height <= 1
-            if dx / half_width + dy / half_height <= 1.0:
-                final_diamond_pixels.append((x, y))
+    # Pixels that will disappear get targets near the diamond edge
+    angles = rng.uniform(0, 2 * math.pi, size=total_start_pixels - matched)
+    # Use diamond dimensions to calculate edge positions
+    edge_distance = min(DIAMOND_WIDTH, DIAMOND_HEIGHT) / 2.0 * 0.8
+    target[matched:, 0] = center_x + (edge_distance * np.cos(angles)).astype(int)
+    target[matched:, 1] = center_y + (edge_distance * np.sin(angles)).astype(int)
 
-    total_start_pixels = len(white_pixels)
-    total_final_pixels = len(final_diamond_pixels)
+    # Add some randomness to movement path for organic feel
+    control = (start + target) / 2 + rng.uniform(-8, 8, size=start.shape)
+
+    # Calculate animation progress (0 to 1) for every frame
+    progress = np.arange(num_frames) / (num_frames - 1)
+
+    # Add some easing for more organic movement
+    eased_progress = 0.5 * (1 - np.cos(progress * np.pi))  # Smooth ease in/out
+
+    # Calculate how many pixels should be visible
+    visible_counts = (total_start_pixels * (1 - progress * 0.4) + total_final_pixels * progress * 0.4).astype(int)
+    visible_counts = np.maximum(visible_counts, total_final_pixels)
+
+    # Add deformation effects
+    deform_strength = np.sin(progress * np.pi) * 3  # Peak deformation in middle
 
-    # Assign each starting pixel a target and movement pattern
-    pixel_data = []
-    for i, (start_x, start_y) in enumerate(white_pixels):
-        # Assign target position in final diamond (some pixels won't have targets)
-        if i < total_final_pixels:
-            target_x, target_y = final_diamond_pixels[i]
-        else:
-            # Pixels that will disappear get targets near the diamond edge
-            angle = random.uniform(0, 2 * math.pi)
-            # Use diamond dimensions to calculate edge positions
-            edge_distance = min(half_width, half_height) * 0.8
-            target_x = center_x + int(edge_distance * math.cos(angle))
-            target_y = center_y + int(edge_distance * math.sin(angle))
-
-        # Add some randomness to movement path for organic feel
-        control_x = (start_x + target_x) / 2 + random.uniform(-8, 8)
-        control_y = (start_y + target_y) / 2 + random.uniform(-8, 8)
-
-        pixel_data.append({
-            'start': (start_x, start_y),
-            'target': (target_x, target_y),
-            'control': (control_x, control_y),
-            'survives': i < total_final_pixels
-        })
-
-    for frame_idx in range(num_frames):
-        # Create new frame
-        frame = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        frame_pixels = frame.load()
-
-        # Calculate animation progress (0 to 1)
-        progress = frame_idx / (num_frames - 1)
-
-        # Add some easing for more organic movement
-        eased_progress = 0.5 * (1 - math.cos(progress * math.pi))  # Smooth ease in/out
-
-        # Calculate how many pixels should be visible
-        visible_count = int(total_start_pixels * (1 - progress * 0.4) + total_final_pixels * progress * 0.4)
-        visible_count = max(visible_count, total_final_pixels)
-
-        # Add deformation effects
-        deform_strength = math.sin(progress * math.pi) * 3  # Peak deformation in middle
-
-        active_pixels = []
-
-        for i, pixel_info in enumerate(pixel_data):
-            start_x, start_y = pixel_info['start']
-            target_x, target_y = pixel_info['target']
-            control_x, control_y = pixel_info['control']
-
-            # Quadratic bezier curve for smooth movement
-            t = eased_progress
-            current_x = (1-t)**2 * start_x + 2*(1-t)*t * control_x + t**2 * target_x
-            current_y = (1-t)**2 * start_y + 2*(1-t)*t * control_y + t**2 * target_y
-
-            # Add deformation (stretching/squeezing effect)
-            dx_to_center = current_x - center_x
-            dy_to_center = current_y - center_y
-            distance_to_center = (dx_to_center**2 + dy_to_center**2)**0.5
-
-            if distance_to_center > 0:
-                # Add radial deformation
-                deform_factor = 1 + deform_strength * math.sin(progress * 2 * math.pi) / distance_to_center
-                current_x = center_x + dx_to_center * deform_factor
-                current_y = center_y + dy_to_center * deform_factor
-
-            # Round to pixel coordinates
-            pixel_x = int(round(current_x))
-            pixel_y = int(round(current_y))
-
-            # Check if pixel should be visible
-            should_survive = pixel_info['survives'] or i < visible_count
-
-            if should_survive and 0 <= pixel_x < width and 0 <= pixel_y < height:
-                active_pixels.append((pixel_x, pixel_y))
-
-        # Draw pixels (handle overlaps by just overwriting)
-        for x, y in active_pixels:
-            frame_pixels[x, y] = (255, 255, 255, 255)
-
-        frames.append(frame)
+    frame_data = np.full((num_frames, height, width), TRANSPARENT_INDEX, dtype=np.uint8)
+    render_morph_frames(start, target, control, survives, visible_counts,
+                        eased_progress, deform_strength, progress, center_x, center_y, frame_data)
+    frames = [create_silhouette_frame(frame) for frame in frame_data]
 
     return frames
 
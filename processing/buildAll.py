@@ -26,6 +26,12 @@ from pathlib import Path
 # Add processing directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from createMonSpritesheets import run as run_mon_sprites
+from createAttackSpritesheets import run as run_attack_sprites
+from validateMoves import run as run_validate
+from generateSolidity import run as run_solidity
+from generateMonsTypeScript import run as run_typescript
+
 
 def print_step(step_num: int, total: int, description: str):
     """Print a step header."""
@@ -68,7 +74,6 @@ def main():
         current_step += 1
         print_step(current_step, total_steps, "Creating mon spritesheets")
         
-        from createMonSpritesheets import run as run_mon_sprites
         if not run_mon_sprites():
             print("\n❌ Failed to create mon spritesheets")
             sys.exit(1)
@@ -78,7 +83,6 @@ def main():
         current_step += 1
         print_step(current_step, total_steps, "Creating attack spritesheets")
         
-        from createAttackSpritesheets import run as run_attack_sprites
         if not run_attack_sprites():
             print("\n❌ Failed to create attack spritesheets")
             sys.exit(1)
@@ -88,7 +92,6 @@ def main():
         current_step += 1
         print_step(current_step, total_steps, "Validating move contracts")
         
-        from validateMoves import run as run_validate
         if not run_validate():
             print("\n⚠️  Move validation found issues. Please review and run again.")
             sys.exit(1)
@@ -97,7 +100,6 @@ def main():
     current_step += 1
     print_step(current_step, total_steps, "Generating Solidity deployment script")
     
-    from generateSolidity import run as run_solidity
     if not run_solidity(include_color=args.color):
         print("\n❌ Failed to generate Solidity deployment script")
         sys.exit(1)
@@ -106,7 +108,6 @@ def main():
     current_step += 1
     print_step(current_step, total_steps, "Generating TypeScript data file")
     
-    from processing.generateMonsTypeScript import run as run_typescript
     if not run_typescript():
         print("\n❌ Failed to generate TypeScript data file")
         sys.exit(1)
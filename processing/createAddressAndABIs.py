@@ -14,102 +14,143 @@ Network flags (one required):
 """
 
 import argparse
+import bisect
+import functools
 import json
+import os
 import re
+import string
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the stdlib json module
+    orjson = None
 
-def parse_addresses_from_content(content: str) -> Dict[str, str]:
-    """Parse addresses from content string with KEY=VALUE lines."""
-    addresses = {}
+# Networks in the order they appear in address.ts
+NETWORKS = ('MAINNET', 'TESTNET')
 
-    for line in content.splitlines():
-        line = line.strip()
-        if not line or '=' not in line:
-            continue
+# Write buffer for generated TypeScript files
+WRITE_BUFFER_SIZE = 1 << 17
 
-        # Split the line into key and value
-        key, value = line.split('=', 1)
+# Opening of a Forge artifact whose first top-level key is "abi"
+_ARTIFACT_ABI_RE = re.compile(rb'\s*\{\s*"abi"\s*:\s*')
+_JSON_DECODER = json.JSONDecoder()
 
-        # Convert the key to uppercase and remove any non-alphanumeric characters
-        key = re.sub(r'[^A-Z0-9_]', '', key.upper())
+# Import preludes for the generated address.ts files
+MUNCH_ADDRESS_HEADER = "import { LowercaseHex } from '../types/structs';\n\n"
+BELCH_ADDRESS_HEADER = "import { Hex } from 'viem';\ntype LowercaseHex = Lowercase<Hex>;\n\n"
 
-        # Convert the value to lowercase (for LowercaseHex type)
-        value = value.lower()
+# Bytes stripped from address keys (after upper-casing): everything except A-Z, 0-9 and _
+_KEY_ALLOWED = (string.ascii_uppercase + string.digits + '_').encode('ascii')
+_KEY_DELETE = bytes(b for b in range(256) if b not in _KEY_ALLOWED)
+# Header of a network block in the nested MAINNET/TESTNET address.ts format
+_NESTED_RE = re.compile(rb'(MAINNET|TESTNET)\s*:\s*\{')
+# A single `KEY: '0x...' as LowercaseHex` entry
+_ADDR_RE = re.compile(rb"(\w+):\s*'(0x[a-f0-9]+)'\s*as\s+LowercaseHex", re.IGNORECASE)
 
-        addresses[key] = value
 
-    return addresses
+def normalize_key(key: str) -> str:
+    """Convert the key to uppercase and remove any non-alphanumeric characters."""
+    # Non-ASCII characters are never kept, so drop them before the byte-level filter
+    return key.upper().encode('ascii', 'ignore').translate(None, _KEY_DELETE).decode('ascii')
 
 
-def read_addresses(input_file: str) -> Dict[str, str]:
-    """Read addresses from output.txt and return a dictionary."""
-    addresses = {}
+@functools.lru_cache(maxsize=None)
+def path_exists(path: Path) -> bool:
+    """Cached Path.exists() for the repository layout, which doesn't change during a run."""
+    return path.exists()
 
-    with open(input_file, 'r') as infile:
-        for line in infile:
-            line = line.strip()
-            if not line or '=' not in line:
-                continue
 
-            # Split the line into key and value
-            key, value = line.split('=', 1)
+@functools.lru_cache(maxsize=None)
+def ensure_dir(path: Path):
+    """Create a directory (and its parents) at most once per run."""
+    path.mkdir(parents=True, exist_ok=True)
 
-            # Convert the key to uppercase and remove any non-alphanumeric characters
-            key = re.sub(r'[^A-Z0-9_]', '', key.upper())
 
-            # Convert the value to lowercase (for LowercaseHex type)
-            value = value.lower()
+def parse_addresses_from_content(content: str) -> Dict[str, str]:
+    """Parse addresses from content string with KEY=VALUE lines."""
+    # Keys are normalized; values are lowercased (for LowercaseHex type)
+    return {
+        normalize_key(key): value.lower()
+        for key, value in (
+            line.split('=', 1)
+            for line in map(str.strip, content.splitlines())
+            if '=' in line
+        )
+    }
 
-            addresses[key] = value
 
-    return addresses
+def read_addresses(input_file: str) -> Dict[str, str]:
+    """Read addresses from output.txt and return a dictionary."""
+    return parse_addresses_from_content(Path(input_file).read_text(encoding='utf-8'))
+
 
+def decode_hex_value(value: bytes) -> str:
+    """Decode a captured hex address as a lowercase string."""
+    return value.lower().decode('ascii')
 
-def parse_existing_addresses(content: str) -> Dict[str, Dict[str, str]]:
-    """Parse existing addresses from file content, handling both flat and nested formats.
+
+def parse_existing_addresses(content: bytes) -> Dict[str, Dict[str, str]]:
+    """Parse existing addresses from raw file content, handling both flat and nested formats.
 
     Returns a dict with 'MAINNET' and 'TESTNET' keys, each containing address dicts.
     For flat format (legacy), all addresses are placed under 'TESTNET'.
     """
     result = {'MAINNET': {}, 'TESTNET': {}}
 
-    # Check if this is a nested format (has MAINNET: { or TESTNET: {)
-    is_nested = bool(re.search(r'(MAINNET|TESTNET)\s*:\s*\{', content))
-
-    if is_nested:
-        # Parse nested format
-        for network in ['MAINNET', 'TESTNET']:
-            # Find the network block
-            pattern = rf'{network}\s*:\s*\{{([^}}]*)\}}'
-            match = re.search(pattern, content, re.DOTALL)
-            if match:
-                block = match.group(1)
-                # Extract addresses from the block
-                addr_pattern = r"(\w+):\s*'(0x[a-f0-9]+)'\s*as\s+LowercaseHex"
-                matches = re.findall(addr_pattern, block, re.IGNORECASE)
-                for key, value in matches:
-                    result[network][key] = value.lower()
-    else:
+    # Locate each network block once: the first header per network, up to its closing brace
+    is_nested = False
+    blocks = {}
+    for match in _NESTED_RE.finditer(content):
+        is_nested = True
+        network = match.group(1).decode('ascii')
+        if network in blocks:
+            continue
+        end = content.find(b'}', match.end())
+        if end != -1:
+            blocks[network] = (match.end(), end)
+
+    if not is_nested:
         # Flat format (legacy) - all addresses go to TESTNET
-        addr_pattern = r"(\w+):\s*'(0x[a-f0-9]+)'\s*as\s+LowercaseHex"
-        matches = re.findall(addr_pattern, content, re.IGNORECASE)
-        for key, value in matches:
-            result['TESTNET'][key] = value.lower()
+        for match in _ADDR_RE.finditer(content):
+            key, value = match.groups()
+            result['TESTNET'][key.decode('ascii')] = decode_hex_value(value)
+        return result
+
+    # Single scan over the content, bucketing each address into the block containing it
+    spans = sorted((start, end, network) for network, (start, end) in blocks.items())
+    starts = [start for start, _, _ in spans]
+    for match in _ADDR_RE.finditer(content):
+        i = bisect.bisect_right(starts, match.start()) - 1
+        if i < 0:
+            continue
+        _, end, network = spans[i]
+        if match.end() <= end:
+            key, value = match.groups()
+            result[network][key.decode('ascii')] = decode_hex_value(value)
 
     return result
 
 
-def update_address_file(
+def write_file_atomic(output_file: str, content: bytes):
+    """Write content to a temporary sibling file, then rename it over output_file."""
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(content)
+    # The rename is atomic, so watchers never see a partially written file
+    os.replace(tmp_file, output_file)
+
+
+def merge_addresses(
     addresses: Dict[str, str],
-    output_file: str,
     network: str,
     existing_addresses: Dict[str, Dict[str, str]],
-    is_belch: bool = False
-):
-    """Update the address.ts file with new addresses for a specific network."""
+) -> Dict[str, Dict[str, str]]:
+    """Merge new addresses into a specific network and sort both networks by key."""
 
     # Merge addresses for the target network (new addresses override existing ones)
     merged = {**existing_addresses.get(network, {}), **addresses}
@@ -122,66 +163,108 @@ def update_address_file(
     updated_addresses[network] = merged
 
     # Sort addresses by key for consistent output
-    sorted_mainnet = dict(sorted(updated_addresses['MAINNET'].items()))
-    sorted_testnet = dict(sorted(updated_addresses['TESTNET'].items()))
+    return {network: dict(sorted(updated_addresses[network].items())) for network in NETWORKS}
 
-    # Generate TypeScript content with different imports based on repository
-    if is_belch:
-        typescript_content = "import { Hex } from 'viem';\n"
-        typescript_content += "type LowercaseHex = Lowercase<Hex>;\n\n"
-    else:
-        typescript_content = "import { LowercaseHex } from '../types/structs';\n\n"
 
-    typescript_content += "export const Address = {\n"
+def build_address_body(sorted_addresses: Dict[str, Dict[str, str]]) -> str:
+    """Build the `export const Address = {...}` body shared by every address.ts file."""
+    parts = []
+    append = parts.append
+
+    append("export const Address = {\n")
+
+    # Write one block per network
+    for network in NETWORKS:
+        append(f"  {network}: {{\n")
+        for key, value in sorted_addresses[network].items():
+            append(f"    {key}: '{value}' as LowercaseHex,\n")
+        append("  },\n")
 
-    # Write MAINNET block
-    typescript_content += "  MAINNET: {\n"
-    for key, value in sorted_mainnet.items():
-        typescript_content += f"    {key}: '{value}' as LowercaseHex,\n"
-    typescript_content += "  },\n"
+    append("};\n")
+    return ''.join(parts)
 
-    # Write TESTNET block
-    typescript_content += "  TESTNET: {\n"
-    for key, value in sorted_testnet.items():
-        typescript_content += f"    {key}: '{value}' as LowercaseHex,\n"
-    typescript_content += "  },\n"
 
-    typescript_content += "};\n"
+def update_address_file(body: str, output_file: str, is_belch: bool = False):
+    """Update the address.ts file with the shared body from build_address_body."""
 
-    # Write to file
-    with open(output_file, 'w') as f:
-        f.write(typescript_content)
+    # Only the imports differ between repositories
+    header = BELCH_ADDRESS_HEADER if is_belch else MUNCH_ADDRESS_HEADER
+    typescript_content = (header + body).encode()
+
+    # Leave the file untouched if nothing changed, so file watchers don't rebuild
+    try:
+        existing = Path(output_file).read_bytes()
+    except FileNotFoundError:
+        existing = None
+    if existing == typescript_content:
+        return
+
+    write_file_atomic(output_file, typescript_content)
 
 
 def extract_abi(contract_name: str, out_dir: Path) -> List:
     """Extract ABI from the out folder for a given contract."""
     json_file = out_dir / f"{contract_name}.sol" / f"{contract_name}.json"
 
-    if not json_file.exists():
-        raise FileNotFoundError(f"ABI file not found: {json_file}")
+    # Read directly instead of probing with exists() first
+    try:
+        raw = json_file.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"ABI file not found: {json_file}") from None
 
-    with open(json_file, 'r') as f:
-        contract_data = json.load(f)
+    # Forge writes "abi" as the first key; decode just that array and skip the bytecode, metadata and AST
+    abi_start = _ARTIFACT_ABI_RE.match(raw)
+    if abi_start:
+        abi, _ = _JSON_DECODER.raw_decode(raw.decode('utf-8'), abi_start.end())
+        return abi
+
+    contract_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     return contract_data.get('abi', [])
 
 
-def create_abi_file(abi: List, abi_name: str, output_file: str):
-    """Create a TypeScript ABI file."""
+def serialize_abi(abi: List, abi_name: str) -> bytes:
+    """Render the TypeScript source for an ABI file."""
+    abi_json = None
+    if orjson is not None:
+        abi_json = orjson.dumps(abi, option=orjson.OPT_INDENT_2)
+        # json.dumps escapes non-ASCII characters; only use orjson's output when it is identical
+        if not abi_json.isascii():
+            abi_json = None
+
+    if abi_json is None:
+        abi_json = json.dumps(abi, indent=2).encode('ascii')
 
-    # Convert ABI to formatted JSON string
-    abi_json = json.dumps(abi, indent=2)
+    return b"export const %s = %s as const;\n" % (abi_name.encode(), abi_json)
 
-    # Create TypeScript content
-    typescript_content = f"export const {abi_name} = {abi_json} as const;\n"
+
+def create_abi_file(typescript_content: bytes, output_file: str):
+    """Create a TypeScript ABI file from content rendered by serialize_abi."""
 
     # Ensure directory exists
-    output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(Path(output_file).parent)
+
+    write_file_atomic(output_file, typescript_content)
+
+
+def write_contract_abi(
+    contract: Tuple[str, str, str],
+    out_dir: Path,
+    abi_dirs: List[Tuple[str, Path]],
+) -> List[Tuple[str, Path]]:
+    """Extract one contract's ABI and write it to every repository, returning (repo, path) pairs."""
+    contract_name, output_filename, abi_const_name = contract
 
-    # Write to file
-    with open(output_file, 'w') as f:
-        f.write(typescript_content)
+    # Extract and serialize the ABI once, then write the same bytes to each repository
+    abi = extract_abi(contract_name, out_dir)
+    typescript_content = serialize_abi(abi, abi_const_name)
+
+    written = []
+    for repo, abi_dir in abi_dirs:
+        output_path = abi_dir / output_filename
+        create_abi_file(typescript_content, str(output_path))
+        written.append((repo, output_path))
+    return written
 
 
 def process_abis(out_dir: Path, game_dir: Path) -> List[Tuple[str, str]]:
@@ -194,33 +277,33 @@ def process_abis(out_dir: Path, game_dir: Path) -> List[Tuple[str, str]]:
         ("DefaultMatchmaker", "matchmaker.ts", "DefaultMatchmakerABI"),
     ]
 
-    # Define output paths for both repositories
-    munch_abi_dir = game_dir / "munch" / "src" / "app" / "types" / "abi"
-    belch_abi_dir = game_dir / "belch" / "src" / "abi"
+    # Define output paths for both repositories, keeping only those that exist
+    abi_dirs = [
+        (repo, abi_dir)
+        for repo, abi_dir in (
+            ("munch", game_dir / "munch" / "src" / "app" / "types" / "abi"),
+            ("belch", game_dir / "belch" / "src" / "abi"),
+        )
+        if path_exists(abi_dir.parent)
+    ]
 
     updated_files = []
 
-    for contract_name, output_filename, abi_const_name in contracts:
-        try:
-            # Extract ABI
-            abi = extract_abi(contract_name, out_dir)
+    # Contracts are independent, so read/decode/write them concurrently; report in order on this thread
+    with ThreadPoolExecutor(max_workers=len(contracts)) as executor:
+        futures = [
+            executor.submit(write_contract_abi, contract, out_dir, abi_dirs)
+            for contract in contracts
+        ]
 
-            # Create ABI file in munch repository
-            if munch_abi_dir.parent.exists():
-                munch_output = munch_abi_dir / output_filename
-                create_abi_file(abi, abi_const_name, str(munch_output))
-                updated_files.append(f"munch: {munch_output}")
-                print(f"✅ Created {output_filename} in munch repository")
+        for (contract_name, output_filename, _), future in zip(contracts, futures):
+            try:
+                for repo, output_path in future.result():
+                    updated_files.append(f"{repo}: {output_path}")
+                    print(f"✅ Created {output_filename} in {repo} repository")
 
-            # Create ABI file in belch repository
-            if belch_abi_dir.parent.exists():
-                belch_output = belch_abi_dir / output_filename
-                create_abi_file(abi, abi_const_name, str(belch_output))
-                updated_files.append(f"belch: {belch_output}")
-                print(f"✅ Created {output_filename} in belch repository")
-
-        except FileNotFoundError as e:
-            print(f"⚠️  Error processing {contract_name}: {e}")
+            except FileNotFoundError as e:
+                print(f"⚠️  Error processing {contract_name}: {e}")
 
     return updated_files
 
@@ -250,28 +333,35 @@ def run_main_logic(addresses: Dict[str, str], network: str):
 
     # Read existing addresses from munch as source of truth
     existing_addresses = {'MAINNET': {}, 'TESTNET': {}}
-    if munch_output_file.exists():
-        with open(munch_output_file, 'r') as f:
-            content = f.read()
+    try:
+        # Address files are ASCII, so parse the raw bytes without decoding the whole file
+        content = munch_output_file.read_bytes()
+    except FileNotFoundError:
+        content = None
+    if content is not None:
         existing_addresses = parse_existing_addresses(content)
         print(f"📖 Read existing addresses from munch (MAINNET: {len(existing_addresses['MAINNET'])}, TESTNET: {len(existing_addresses['TESTNET'])})")
     else:
         print(f"⚠️  No existing munch address file found, starting fresh")
 
+    # Merge, sort and format once; munch and belch only differ in their imports
+    sorted_addresses = merge_addresses(addresses, network, existing_addresses)
+    body = build_address_body(sorted_addresses)
+
     # Track which files were updated
     updated_files = []
 
     # Update munch repository
-    if munch_output_file.parent.exists():
-        update_address_file(addresses, str(munch_output_file), network, existing_addresses, is_belch=False)
+    if path_exists(munch_output_file.parent):
+        update_address_file(body, str(munch_output_file), is_belch=False)
         updated_files.append(f"munch: {munch_output_file}")
         print(f"✅ Updated address.ts in munch repository")
     else:
         print(f"⚠️  Munch repository not found at {munch_output_file.parent}")
 
-    # Update belch repository (using the same existing_addresses from munch)
-    if belch_output_file.parent.exists():
-        update_address_file(addresses, str(belch_output_file), network, existing_addresses, is_belch=True)
+    # Update belch repository (using the same merged addresses as munch)
+    if path_exists(belch_output_file.parent):
+        update_address_file(body, str(belch_output_file), is_belch=True)
         updated_files.append(f"belch: {belch_output_file}")
         print(f"✅ Updated address.ts in belch repository")
     else:
@@ -279,7 +369,7 @@ def run_main_logic(addresses: Dict[str, str], network: str):
 
     # Fallback if neither repository was found
     if not updated_files:
-        update_address_file(addresses, str(fallback_output_file), network, existing_addresses, is_belch=False)
+        update_address_file(body, str(fallback_output_file), is_belch=False)
         print(f"✅ Updated address.ts (fallback): {fallback_output_file}")
 
     print(f"\n✅ Address files updated: {len(updated_files)}")
@@ -289,7 +379,7 @@ def run_main_logic(addresses: Dict[str, str], network: str):
     print("PROCESSING ABIs")
     print("=" * 60)
 
-    if not out_dir.exists():
+    if not path_exists(out_dir):
         print(f"⚠️  Out directory not found: {out_dir}")
         print("Skipping ABI extraction")
     else:
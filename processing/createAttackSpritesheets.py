@@ -1,15 +1,36 @@
 #!/usr/bin/env python3
 """Create spritesheets from attack animation PNG files with JSON metadata."""
 
+import functools
 import hashlib
 import json
 import math
+import os
+import shutil
+import struct
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
+
+import numpy as np
 from PIL import Image
 
+try:
+    import oxipng
+except ImportError:  # Optional speedup; falls back to the oxipng command-line tool
+    oxipng = None
+
+try:
+    import xxhash
+except ImportError:  # Optional speedup; falls back to hashlib.blake2b
+    xxhash = None
+
 DEFAULT_FRAME_SIZE = 96
+DEFAULT_MS_PER_FRAME = 100
 
 # Special case: files with non-standard frame sizes (width, height)
 # For most files, width == height (square frames)
@@ -31,18 +52,59 @@ GACHACHACHA_VARIANTS = ["gachachacha_bunnies", "gachachacha_carrots", "gachachac
 # Special case: files that need vertical flip applied to each frame
 VERTICAL_FLIP_FILES = {"stat_boost_enemy", "stat_debuff_player"}
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
 # Output files to exclude from input scanning
 OUTPUT_FILES = {"attack_spritesheet.png", "non_standard_spritesheet.png"}
 
+# oxipng optimization level; levels above 4 rarely shrink the output further but are much slower
+OXIPNG_LEVEL = 4
 
-def find_valid_attack_pngs(directory: str) -> list[tuple[str, int, int, tuple[int, int], tuple[int, int]]]:
-    """Find all PNG files whose dimensions are evenly divisible by their frame size.
+# Pillow's zlib level: oxipng re-deflates from the raw pixels, so when it is installed the cheapest level will do
+FAST_COMPRESS_LEVEL = 1
+DEFAULT_COMPRESS_LEVEL = 6
 
-    Returns list of (path, cols, rows, source_frame_size, output_frame_size) tuples.
-    Frame sizes are (width, height) tuples.
-    """
+# Pixel digests and file stamps of spritesheets already compressed by oxipng, stored next to the outputs
+OXIPNG_CACHE_FILE = ".oxipng_cache.json"
+
+# Fingerprint of the inputs and outputs of the last complete run, stored next to the outputs
+FINGERPRINT_FILE = ".attack_spritesheet.cache"
+
+# Copies of the spritesheets go to the munch repository, when it is checked out next to this one
+MUNCH_ASSETS_DIR = Path(__file__).parent.parent.parent / "munch" / "src" / "assets" / "attacks"
+
+
+@dataclass(slots=True, frozen=True)
+class PngSpec:
+    """A source attack PNG and the frame grid it is cut into."""
+    path: str
+    name: str
+    cols: int
+    rows: int
+    source_size: tuple[int, int]  # (width, height) of each frame in the source
+    output_size: tuple[int, int]  # (width, height) of each frame after cropping
+
+
+def read_png_size(path: Path) -> tuple[int, int]:
+    """Read (width, height) from a PNG's IHDR chunk without decoding the image."""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    # 8-byte signature, then the IHDR chunk's length and type, then big-endian width and height
+    if header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        raise ValueError("not a PNG file")
+    return struct.unpack('>II', header[16:24])
+
+
+def find_valid_attack_pngs(directory: str) -> list[PngSpec]:
+    """Find all PNG files whose dimensions are evenly divisible by their frame size."""
     result = []
-    for f in sorted(Path(directory).glob("*.png")):
+    with os.scandir(directory) as entries:
+        # Skip hidden files such as macOS AppleDouble "._name.png" companions, as glob("*.png") did
+        png_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(".png") and not entry.name.startswith(".") and entry.is_file()
+        )
+    for f in png_files:
         if f.name in OUTPUT_FILES:
             continue
         try:
@@ -61,155 +123,258 @@ def find_valid_attack_pngs(directory: str) -> list[tuple[str, int, int, tuple[in
             else:
                 source_w = source_h = output_w = output_h = DEFAULT_FRAME_SIZE
 
-            with Image.open(f) as img:
-                w, h = img.size
-                if w % source_w == 0 and h % source_h == 0:
-                    cols = w // source_w
-                    rows = h // source_h
-                    result.append((str(f), cols, rows, (source_w, source_h), (output_w, output_h)))
-                else:
-                    print(f"⚠ Skipping {f.name}: {w}x{h} not divisible by {source_w}x{source_h}")
+            w, h = read_png_size(f)
+            if w % source_w == 0 and h % source_h == 0:
+                cols = w // source_w
+                rows = h // source_h
+                result.append(PngSpec(str(f), name, cols, rows, (source_w, source_h), (output_w, output_h)))
+            else:
+                print(f"⚠ Skipping {f.name}: {w}x{h} not divisible by {source_w}x{source_h}")
         except Exception as e:
             print(f"Warning: Could not read {f}: {e}")
     return result
 
 
-def extract_frames_from_spritesheet(
+@functools.lru_cache(maxsize=None)
+def load_sheet(png_path: str) -> np.ndarray:
+    """Decode a PNG into a read-only (height, width, 4) RGBA array, once per path.
+
+    The cache only lives for one create_attack_spritesheets call, so edited sources are decoded again.
+    It is unbounded: the frame views of a size group keep every decoded sheet alive until the group
+    array is built anyway, and the parallel prefetch must not be evicted before extraction reads it.
+    """
+    with Image.open(png_path) as img:
+        # convert() copies the whole sheet even when the mode already matches
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        sheet = np.asarray(img)
+    # Shared between callers through the cache, so make sure nobody writes to it
+    sheet.flags.writeable = False
+    return sheet
+
+
+def frame_grid_view(
     png_path: str, cols: int, rows: int, frame_size: tuple[int, int] = (DEFAULT_FRAME_SIZE, DEFAULT_FRAME_SIZE),
     crop: tuple[int, int, int, int] | None = None, vertical_flip: bool = False
-) -> list[Image.Image]:
-    """Extract all frames from a spritesheet PNG (left-to-right, top-to-bottom).
+) -> np.ndarray:
+    """View a spritesheet PNG as a (rows, cols, height, width, 4) grid of frames without copying.
 
     Args:
         frame_size: (width, height) of each frame
         crop: Optional (top, right, bottom, left) pixels to crop from each frame.
               Applied before vertical flip.
     """
-    frames = []
     frame_w, frame_h = frame_size
-    with Image.open(png_path) as img:
-        img = img.convert('RGBA')
-        for row in range(rows):
-            for col in range(cols):
-                x = col * frame_w
-                y = row * frame_h
-                frame = img.crop((x, y, x + frame_w, y + frame_h))
-                if crop:
-                    top, right, bottom, left = crop
-                    frame = frame.crop((left, top, frame_w - right, frame_h - bottom))
-                if vertical_flip:
-                    frame = frame.transpose(Image.FLIP_TOP_BOTTOM)
-                frames.append(frame.copy())
+    sheet = load_sheet(png_path)
+
+    # Frames are strided views into the decoded sheet; crop and flip are slices
+    frames = sheet[:rows * frame_h, :cols * frame_w].reshape(rows, frame_h, cols, frame_w, 4).swapaxes(1, 2)
+    if crop:
+        top, right, bottom, left = crop
+        frames = frames[:, :, top:frame_h - bottom, left:frame_w - right]
+    if vertical_flip:
+        frames = frames[:, :, ::-1]
     return frames
 
 
-def frame_hash(frame: Image.Image) -> str:
-    """Compute a hash for a frame to detect duplicates."""
-    return hashlib.md5(frame.tobytes()).hexdigest()
+def frame_hash(data: np.ndarray) -> int:
+    """Compute a hash of a frame's raw pixels (any contiguous buffer) to detect duplicates.
+
+    Only used to bucket identical frames, so a fast non-cryptographic hash is enough.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest())
 
 
-def process_gachachacha_variants(
-    variant_data: list[tuple[str, int, int, tuple[int, int]]]
-) -> tuple[list[Image.Image], dict[str, list[int]]]:
+def process_gachachacha_variants(variant_data: list[PngSpec]) -> tuple[np.ndarray, dict[str, list[int]]]:
     """Process gachachacha variants, deduplicating shared frames.
 
     Returns:
-        - List of unique frames (shared frames first, then unique frames per variant)
+        - Array of unique frames (shared frames first, then unique frames per variant)
         - Dict mapping variant name to list of frame indices
     """
-    # Extract frames from all variants
-    variant_frames: dict[str, list[Image.Image]] = {}
-    for png_path, cols, rows, source_size in variant_data:
-        name = Path(png_path).stem
-        variant_frames[name] = extract_frames_from_spritesheet(png_path, cols, rows, source_size)
-        print(f"Extracted {len(variant_frames[name])} frames from {Path(png_path).name} ({cols}x{rows} grid)")
+    # View the frames of all variants; a frame is only copied once it is stacked into the result
+    variant_frames: dict[str, list[np.ndarray]] = {}
+    for spec in variant_data:
+        grid = frame_grid_view(spec.path, spec.cols, spec.rows, spec.source_size)
+        variant_frames[spec.name] = [grid[row, col] for row in range(spec.rows) for col in range(spec.cols)]
+        print(f"Extracted {len(variant_frames[spec.name])} frames from {Path(spec.path).name} ({spec.cols}x{spec.rows} grid)")
 
     # All variants should have same frame count
     frame_count = len(next(iter(variant_frames.values())))
     variant_names = list(variant_frames.keys())
 
-    # Identify shared vs unique frames by comparing hashes
-    unique_frames: list[Image.Image] = []
-    frame_hash_to_index: dict[str, int] = {}
+    # Identify shared vs unique frames by comparing hashes of a sampled view, confirmed by a full compare
+    unique_frames: list[np.ndarray] = []
+    frame_hash_to_indices: dict[int, list[int]] = {}
+
+    def unique_index(frame: np.ndarray) -> int:
+        """Index of frame in unique_frames, adding it if no identical frame is there yet."""
+        candidates = frame_hash_to_indices.setdefault(frame_hash(np.ascontiguousarray(frame[::4, ::4])), [])
+        for idx in candidates:
+            if np.array_equal(unique_frames[idx], frame):
+                return idx
+        candidates.append(len(unique_frames))
+        unique_frames.append(frame)
+        return candidates[-1]
     variant_indices: dict[str, list[int]] = {name: [] for name in variant_names}
 
-    for frame_idx in range(frame_count):
-        # Get frames and hashes for this position across all variants
-        frames_at_pos = [(name, variant_frames[name][frame_idx]) for name in variant_names]
-        hashes_at_pos = [(name, frame_hash(frame)) for name, frame in frames_at_pos]
+    # Other variants are compared against the first one as they are visited
+    reference_frames = variant_frames[variant_names[0]]
+    other_names = variant_names[1:]
 
-        # Check if all variants have the same frame at this position
-        all_same = len(set(h for _, h in hashes_at_pos)) == 1
+    for frame_idx in range(frame_count):
+        # Check if all variants have the same frame at this position (a pixel compare, no hashing);
+        # stops at the first variant that differs
+        first_frame = reference_frames[frame_idx]
+        all_same = all(np.array_equal(variant_frames[name][frame_idx], first_frame) for name in other_names)
 
         if all_same:
             # Shared frame - use first variant's frame, reuse index for all
-            h = hashes_at_pos[0][1]
-            if h not in frame_hash_to_index:
-                frame_hash_to_index[h] = len(unique_frames)
-                unique_frames.append(frames_at_pos[0][1])
-            idx = frame_hash_to_index[h]
+            idx = unique_index(first_frame)
             for name in variant_names:
                 variant_indices[name].append(idx)
         else:
             # Different frames - add each variant's unique frame
-            for name, frame in frames_at_pos:
-                h = frame_hash(frame)
-                if h not in frame_hash_to_index:
-                    frame_hash_to_index[h] = len(unique_frames)
-                    unique_frames.append(frame)
-                variant_indices[name].append(frame_hash_to_index[h])
+            for name in variant_names:
+                variant_indices[name].append(unique_index(variant_frames[name][frame_idx]))
 
     total_original = frame_count * len(variant_names)
     print(f"  → Deduplicated: {total_original} frames -> {len(unique_frames)} unique frames")
 
-    return unique_frames, variant_indices
+    return np.stack(unique_frames), variant_indices
 
 
-def build_spritesheet(frames: list[Image.Image], frame_size: tuple[int, int]) -> tuple[Image.Image, list[tuple[int, int]]]:
-    """Create spritesheet image and return frame positions.
+def build_spritesheet(
+    frames: np.ndarray, frame_size: tuple[int, int], cols: int | None = None
+) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """Create spritesheet pixels as a (height, width, 4) array and return frame positions.
 
     Args:
-        frames: List of frames to pack into spritesheet
+        frames: (frame_count, height, width, 4) array of frames to pack into spritesheet
         frame_size: (width, height) of each frame
+        cols: Frames per row; defaults to a square grid
     """
     frame_w, frame_h = frame_size
-    cols = math.ceil(math.sqrt(len(frames)))
-    rows = math.ceil(len(frames) / cols)
-    sheet = Image.new('RGBA', (cols * frame_w, rows * frame_h), (0, 0, 0, 0))
-    positions = []
-    for i, frame in enumerate(frames):
-        x, y = (i % cols) * frame_w, (i // cols) * frame_h
-        sheet.paste(frame, (x, y))
-        positions.append((x, y))
+    frame_count = len(frames)
+    if cols is None:
+        cols = math.ceil(math.sqrt(frame_count))
+    rows = math.ceil(frame_count / cols)
+
+    # Allocate the transparent sheet once and copy frames into a (rows, cols, frame_h, frame_w, 4) view of it
+    sheet = np.zeros((rows * frame_h, cols * frame_w, 4), dtype=np.uint8)
+    grid = sheet.reshape(rows, frame_h, cols, frame_w, 4).swapaxes(1, 2)
+    full_rows, remainder = divmod(frame_count, cols)
+    grid[:full_rows] = frames[:full_rows * cols].reshape(full_rows, cols, frame_h, frame_w, 4)
+    if remainder:
+        grid[full_rows, :remainder] = frames[full_rows * cols:]
+
+    positions = [((i % cols) * frame_w, (i // cols) * frame_h) for i in range(frame_count)]
     return sheet, positions
 
 
-def run_oxipng(png_path: Path) -> None:
-    """Run oxipng compression on a PNG file."""
+def run_oxipng(png_paths: list[Path]) -> bool:
+    """Run oxipng compression on a batch of PNG files in a single invocation.
+
+    oxipng spreads the files across its own thread pool, so one process handles every output.
+    Returns True if every file was compressed.
+    """
+    if not png_paths:
+        return True
     try:
+        # --alpha lets oxipng recolour fully transparent pixels (plentiful in packed sheets) so they deflate better
         result = subprocess.run(
-            ["oxipng", "-o", "6", "--strip", "safe", str(png_path)],
+            ["oxipng", "-o", str(OXIPNG_LEVEL), "--alpha", "--strip", "safe", "--", *map(str, png_paths)],
             capture_output=True,
             text=True,
             timeout=300
         )
         if result.returncode == 0:
-            print(f"  ✓ Compressed with oxipng")
-        else:
-            print(f"  ⚠ oxipng warning (non-zero exit): {result.returncode}")
+            print(f"  ✓ Compressed {len(png_paths)} PNG(s) with oxipng")
+            return True
+        print(f"  ⚠ oxipng warning (non-zero exit): {result.returncode}")
     except FileNotFoundError:
         print(f"  ⚠ oxipng not found, skipping compression")
     except subprocess.TimeoutExpired:
         print(f"  ⚠ oxipng timed out")
     except Exception as e:
         print(f"  ⚠ oxipng error: {e}")
+    return False
+
+
+def pixel_digest(pixels: np.ndarray) -> str:
+    """Digest of a spritesheet's size and pixels, used to detect unchanged outputs."""
+    height, width = pixels.shape[:2]
+    return f"{width}x{height}:{frame_hash(np.ascontiguousarray(pixels)):032x}"
+
+
+def load_oxipng_cache(cache_path: Path) -> dict[str, dict]:
+    """Load the output path -> {digest, size, mtime_ns} map of already-compressed spritesheets."""
+    try:
+        return json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def cache_key(path: Path) -> str:
+    """Key of an output PNG in the oxipng cache."""
+    return str(path.resolve())
+
+
+def cache_entry(path: Path, digest: str) -> dict:
+    """Record the compressed file now at path, so later runs can tell whether it was replaced."""
+    stat = path.stat()
+    return {"digest": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def is_cached(oxipng_cache: dict[str, dict], path: Path, digest: str) -> bool:
+    """True if path still holds the compressed spritesheet with these pixels that this script wrote.
+
+    Comparing size and mtime catches outputs replaced behind our back, e.g. by a git checkout or merge.
+    """
+    entry = oxipng_cache.get(cache_key(path))
+    if not isinstance(entry, dict) or entry.get("digest") != digest:
+        return False
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
 
+def save_png(
+    pixels: np.ndarray, path: Path, description: str, digest: str, oxipng_cache: dict[str, dict], compress_level: int
+) -> bool:
+    """Save a PNG unless the compressed copy on disk already has the same pixels.
 
-def save_and_compress_png(sheet: Image.Image, path: Path, description: str) -> None:
-    """Save a PNG and run oxipng compression on it."""
-    sheet.save(path, "PNG")
-    print(f"✅ {description} saved: {sheet.size[0]}x{sheet.size[1]} -> {path}")
-    run_oxipng(path)
+    With the oxipng Python bindings installed the PNG is optimized in memory before it is written.
+    Otherwise returns True if the file was written; compression is then run in one batched oxipng call.
+    """
+    if is_cached(oxipng_cache, path, digest):
+        print(f"✅ {description} unchanged, skipping: {path}")
+        return False
+    if oxipng is None:
+        Image.fromarray(pixels).save(path, "PNG", compress_level=compress_level)
+        print(f"✅ {description} saved: {pixels.shape[1]}x{pixels.shape[0]} -> {path}")
+        return True
+
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, "PNG", compress_level=FAST_COMPRESS_LEVEL)
+    try:
+        # Same settings as the run_oxipng command line
+        path.write_bytes(oxipng.optimize_from_memory(
+            buffer.getvalue(), level=OXIPNG_LEVEL, strip=oxipng.StripChunks.safe(), optimize_alpha=True
+        ))
+        oxipng_cache[cache_key(path)] = cache_entry(path, digest)
+        print(f"✅ {description} saved and compressed: {pixels.shape[1]}x{pixels.shape[0]} -> {path}")
+    except Exception as e:
+        # The level-1 encoding is only a fast input for oxipng; keep a normally compressed file instead
+        Image.fromarray(pixels).save(path, "PNG", compress_level=DEFAULT_COMPRESS_LEVEL)
+        oxipng_cache.pop(cache_key(path), None)
+        print(f"✅ {description} saved: {pixels.shape[1]}x{pixels.shape[0]} -> {path}")
+        print(f"  ⚠ oxipng error: {e}")
+    return False
 
 
 def compact_json(obj, indent=2):
@@ -218,77 +383,87 @@ def compact_json(obj, indent=2):
         if isinstance(v, dict):
             if not v:
                 return '{}'
-            items = []
-            for k, val in v.items():
-                items.append(' ' * (level + indent) + json.dumps(k) + ': ' + format_value(val, level + indent))
+            pad = ' ' * (level + indent)
+            items = [pad + encode_basestring_ascii(k) + ': ' + format_value(val, level + indent) for k, val in v.items()]
             return '{\n' + ',\n'.join(items) + '\n' + ' ' * level + '}'
-        elif isinstance(v, list):
-            return json.dumps(v)
-        else:
-            return json.dumps(v)
+        # Arrays and scalars are emitted inline by the C encoder in one call
+        return json.dumps(v)
     return format_value(obj, 0)
 
 
-def process_size_group(
-    size_files: list[tuple[str, int, int, tuple[int, int]]], output_size: tuple[int, int]
-) -> tuple[list[Image.Image], dict[str, dict]]:
+def process_size_group(size_files: list[PngSpec], output_size: tuple[int, int]) -> tuple[np.ndarray, dict[str, dict]]:
     """Process a group of files with the same output frame size.
 
     Returns:
-        - List of extracted frames
+        - (frame_count, height, width, 4) array of extracted frames
         - Dict of metadata entries (with internal indices, not yet converted to positions)
     """
-    all_frames = []
+    # Per-file (rows, cols, height, width, 4) frame views, copied into the result once at the end
+    frame_arrays: list[np.ndarray] = []
+    frame_count = 0
     size_metadata = {}
 
+    # Decode the group's sources in parallel (Pillow releases the GIL while inflating); extraction hits the cache
+    workers = min(len(size_files), os.cpu_count() or 1)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(load_sheet, [spec.path for spec in size_files]))
+
     # Separate gachachacha variants from regular files
-    gachachacha_files = []
-    regular_files = []
-    for png_path, cols, rows, source_size in size_files:
-        name = Path(png_path).stem
-        if name in GACHACHACHA_VARIANTS:
-            gachachacha_files.append((png_path, cols, rows, source_size))
-        else:
-            regular_files.append((png_path, cols, rows, source_size))
+    gachachacha_files = [spec for spec in size_files if spec.name in GACHACHACHA_VARIANTS]
+    regular_files = [spec for spec in size_files if spec.name not in GACHACHACHA_VARIANTS]
 
     # Process regular files
-    for png_path, cols, rows, source_size in regular_files:
-        name = Path(png_path).stem
-        vertical_flip = name in VERTICAL_FLIP_FILES
-        crop = FRAME_CROP.get(name)
-        frames = extract_frames_from_spritesheet(png_path, cols, rows, source_size, crop, vertical_flip)
+    for spec in regular_files:
+        vertical_flip = spec.name in VERTICAL_FLIP_FILES
+        crop = FRAME_CROP.get(spec.name)
+        frames = frame_grid_view(spec.path, spec.cols, spec.rows, spec.source_size, crop, vertical_flip)
+        count = spec.cols * spec.rows
         flip_note = " (flipped)" if vertical_flip else ""
         crop_note = " (cropped)" if crop else ""
-        source_w, source_h = source_size
-        print(f"Extracted {len(frames)} frames from {Path(png_path).name} ({cols}x{rows} grid @ {source_w}x{source_h}){crop_note}{flip_note}")
+        source_w, source_h = spec.source_size
+        print(f"Extracted {count} frames from {Path(spec.path).name} ({spec.cols}x{spec.rows} grid @ {source_w}x{source_h}){crop_note}{flip_note}")
 
-        frame_start = len(all_frames)
-        all_frames.extend(frames)
-        size_metadata[name] = {"_start": frame_start, "_count": len(frames), "_size": output_size}
+        size_metadata[spec.name] = {"_start": frame_count, "_count": count, "_size": output_size}
+        frame_arrays.append(frames)
+        frame_count += count
 
     # Process gachachacha variants with deduplication
     if gachachacha_files:
         print(f"\nProcessing gachachacha variants with deduplication...")
         gacha_frames, gacha_indices = process_gachachacha_variants(gachachacha_files)
-        gacha_frame_start = len(all_frames)
-        all_frames.extend(gacha_frames)
+        gacha_frame_start = frame_count
+        frame_arrays.append(gacha_frames[np.newaxis])  # A single row of frames
+        frame_count += len(gacha_frames)
 
         # Store indices (will be converted to positions later)
         for name, indices in gacha_indices.items():
             size_metadata[name] = {"_gacha_start": gacha_frame_start, "_gacha_indices": indices, "_size": output_size}
 
+    # Copy every frame view straight into one contiguous array, in order
+    output_w, output_h = output_size
+    all_frames = np.empty((frame_count, output_h, output_w, 4), dtype=np.uint8)
+    start = 0
+    for frames in frame_arrays:
+        rows, cols = frames.shape[:2]
+        np.copyto(all_frames[start:start + rows * cols].reshape(frames.shape), frames)
+        start += rows * cols
     return all_frames, size_metadata
 
 
 def finalize_metadata(
-    size_metadata: dict[str, dict], positions: list[tuple[int, int]], existing_metadata: dict
+    size_metadata: dict[str, dict], positions: list[tuple[int, int]], ms_per_frame: dict[str, int]
 ) -> dict[str, dict]:
-    """Convert internal metadata indices to actual frame positions."""
+    """Convert internal metadata indices to actual frame positions.
+
+    Args:
+        ms_per_frame: msPerFrame values from the existing metadata, by animation name
+    """
     result = {}
     for name, data in size_metadata.items():
         anim_w, anim_h = data.pop("_size")
         # Get existing msPerFrame or use default
-        existing_ms = existing_metadata.get(name, {}).get("msPerFrame", 100)
+        existing_ms = ms_per_frame.get(name, DEFAULT_MS_PER_FRAME)
 
         if "_start" in data:
             # Regular attack
@@ -310,9 +485,14 @@ def finalize_metadata(
     return result
 
 
-def create_attack_spritesheets(png_files: list[tuple[str, int, int, tuple[int, int], tuple[int, int]]], output_dir: str):
-    """Create combined attack spritesheet with metadata."""
+def create_attack_spritesheets(png_files: list[PngSpec], output_dir: str) -> bool:
+    """Create combined attack spritesheet with metadata.
+
+    Returns True if every spritesheet written or kept by this run is compressed and recorded in the oxipng cache.
+    """
     output_path = Path(output_dir)
+    # Sources may have changed since an earlier run in this process (e.g. one that raised before clearing)
+    load_sheet.cache_clear()
 
     # Load existing JSON files to preserve msPerFrame values
     standard_json_path = output_path / "attack_spritesheet.json"
@@ -325,22 +505,33 @@ def create_attack_spritesheets(png_files: list[tuple[str, int, int, tuple[int, i
                 print(f"📖 Loaded existing metadata from {json_path}")
             except Exception as e:
                 print(f"⚠ Could not load existing JSON {json_path}: {e}")
+    ms_per_frame = {
+        name: data.get("msPerFrame", DEFAULT_MS_PER_FRAME)
+        for name, data in existing_metadata.items() if isinstance(data, dict)
+    }
 
     # Group files by OUTPUT frame size (after cropping)
     # Key is (width, height) tuple
-    files_by_size: dict[tuple[int, int], list[tuple[str, int, int, tuple[int, int]]]] = {}
-    for png_path, cols, rows, source_size, output_size in png_files:
-        if output_size not in files_by_size:
-            files_by_size[output_size] = []
-        files_by_size[output_size].append((png_path, cols, rows, source_size))
+    files_by_size: dict[tuple[int, int], list[PngSpec]] = {}
+    for spec in png_files:
+        if spec.output_size not in files_by_size:
+            files_by_size[spec.output_size] = []
+        files_by_size[spec.output_size].append(spec)
 
     standard_metadata = {}
     non_standard_metadata = {}
-
-    # Determine munch output location
-    base_path = Path(__file__).parent
-    game_dir = base_path.parent.parent
-    munch_assets_dir = game_dir / "munch" / "src" / "assets" / "attacks"
+    # Saved spritesheets with their pixel digests and pixels, compressed together by a single oxipng run at the end
+    oxipng_cache_path = output_path / OXIPNG_CACHE_FILE
+    oxipng_cache = load_oxipng_cache(oxipng_cache_path)
+    loaded_oxipng_cache = dict(oxipng_cache)
+    saved_pngs: dict[Path, tuple[str, np.ndarray]] = {}
+    # (compressed source, munch destination, digest, description), copied once compression is done
+    munch_copies: list[tuple[Path, Path, str, str]] = []
+    # Every output spritesheet and the pixel digest it should have
+    output_digests: dict[Path, str] = {}
+    compress_level = FAST_COMPRESS_LEVEL if oxipng is not None or shutil.which("oxipng") else DEFAULT_COMPRESS_LEVEL
+
+    munch_assets_dir = MUNCH_ASSETS_DIR
 
     # Separate standard (96x96) from non-standard sizes
     standard_size = (DEFAULT_FRAME_SIZE, DEFAULT_FRAME_SIZE)
@@ -355,17 +546,20 @@ def create_attack_spritesheets(png_files: list[tuple[str, int, int, tuple[int, i
 
         all_frames, size_metadata = process_size_group(standard_files, standard_size)
 
-        if all_frames:
-            sheet, positions = build_spritesheet(all_frames, standard_size)
+        if len(all_frames):
+            sheet_pixels, positions = build_spritesheet(all_frames, standard_size)
+            digest = pixel_digest(sheet_pixels)
             sheet_path = output_path / "attack_spritesheet.png"
-            save_and_compress_png(sheet, sheet_path, f"Attack spritesheet ({DEFAULT_FRAME_SIZE}x{DEFAULT_FRAME_SIZE})")
+            output_digests[sheet_path] = digest
+            if save_png(sheet_pixels, sheet_path, f"Attack spritesheet ({DEFAULT_FRAME_SIZE}x{DEFAULT_FRAME_SIZE})",
+                        digest, oxipng_cache, compress_level):
+                saved_pngs[sheet_path] = (digest, sheet_pixels)
 
             if munch_assets_dir.exists():
-                print(f"\n📋 Copying to munch repository: {munch_assets_dir}")
-                munch_sheet_path = munch_assets_dir / "attack_spritesheet.png"
-                save_and_compress_png(sheet, munch_sheet_path, f"Munch attack spritesheet ({DEFAULT_FRAME_SIZE}x{DEFAULT_FRAME_SIZE})")
+                munch_copies.append((sheet_path, munch_assets_dir / "attack_spritesheet.png", digest,
+                                     f"Munch attack spritesheet ({DEFAULT_FRAME_SIZE}x{DEFAULT_FRAME_SIZE})"))
 
-            standard_metadata.update(finalize_metadata(size_metadata, positions, existing_metadata))
+            standard_metadata.update(finalize_metadata(size_metadata, positions, ms_per_frame))
 
     # Process non-standard frames - combine all sizes into one spritesheet
     if non_standard_sizes:
@@ -373,8 +567,8 @@ def create_attack_spritesheets(png_files: list[tuple[str, int, int, tuple[int, i
         print(f"Processing non-standard frames ({len(non_standard_sizes)} size groups)...")
         print(f"{'=' * 50}")
 
-        # Build individual grids for each size, then stack vertically
-        grid_images: list[tuple[Image.Image, list[tuple[int, int]], dict[str, dict]]] = []
+        # Extract every size group first so the sheet width is known before laying out any grid
+        size_groups: list[tuple[tuple[int, int], np.ndarray, dict[str, dict]]] = []
 
         for output_size in sorted(non_standard_sizes.keys()):
             size_files = non_standard_sizes[output_size]
@@ -383,41 +577,94 @@ def create_attack_spritesheets(png_files: list[tuple[str, int, int, tuple[int, i
 
             all_frames, size_metadata = process_size_group(size_files, output_size)
 
-            if all_frames:
-                sheet, positions = build_spritesheet(all_frames, output_size)
-                grid_images.append((sheet, positions, size_metadata))
-                print(f"  → Built grid: {sheet.size[0]}x{sheet.size[1]}")
+            if len(all_frames):
+                size_groups.append((output_size, all_frames, size_metadata))
+
+        # The widest square grid sets the sheet width; every other group fills shelves of that width
+        # instead of a narrow square grid, so less of the combined sheet is transparent padding
+        sheet_width = max((math.ceil(math.sqrt(len(frames))) * size[0] for size, frames, _ in size_groups), default=0)
+
+        # Build individual grids for each size, then stack vertically
+        grid_images: list[tuple[np.ndarray, list[tuple[int, int]], dict[str, dict]]] = []
+
+        for output_size, all_frames, size_metadata in size_groups:
+            cols = min(len(all_frames), max(sheet_width // output_size[0], 1))
+            sheet, positions = build_spritesheet(all_frames, output_size, cols)
+            grid_images.append((sheet, positions, size_metadata))
+            print(f"  → Built {output_size[0]}x{output_size[1]} grid: {sheet.shape[1]}x{sheet.shape[0]}")
 
         if grid_images:
             # Calculate combined image dimensions
-            max_width = max(img.size[0] for img, _, _ in grid_images)
-            total_height = sum(img.size[1] for img, _, _ in grid_images)
+            max_width = max(grid.shape[1] for grid, _, _ in grid_images)
+            total_height = sum(grid.shape[0] for grid, _, _ in grid_images)
 
-            # Create combined image and adjust positions
-            combined = Image.new('RGBA', (max_width, total_height), (0, 0, 0, 0))
+            # Stack the grids into one transparent array and adjust positions
+            combined_pixels = np.zeros((total_height, max_width, 4), dtype=np.uint8)
             y_offset = 0
 
             for sheet, positions, size_metadata in grid_images:
-                combined.paste(sheet, (0, y_offset))
+                sheet_h, sheet_w = sheet.shape[:2]
+                combined_pixels[y_offset:y_offset + sheet_h, :sheet_w] = sheet
 
                 # Adjust positions with y_offset and finalize metadata
                 adjusted_positions = [(x, y + y_offset) for x, y in positions]
-                non_standard_metadata.update(finalize_metadata(size_metadata, adjusted_positions, existing_metadata))
+                non_standard_metadata.update(finalize_metadata(size_metadata, adjusted_positions, ms_per_frame))
 
-                y_offset += sheet.size[1]
+                y_offset += sheet_h
+
+            digest = pixel_digest(combined_pixels)
 
             # Save combined non-standard spritesheet
             sheet_path = output_path / "non_standard_spritesheet.png"
-            save_and_compress_png(combined, sheet_path, f"Non-standard spritesheet (combined)")
+            output_digests[sheet_path] = digest
+            if save_png(combined_pixels, sheet_path, f"Non-standard spritesheet (combined)", digest, oxipng_cache,
+                        compress_level):
+                saved_pngs[sheet_path] = (digest, combined_pixels)
 
             if munch_assets_dir.exists():
-                print(f"\n📋 Copying to munch repository: {munch_assets_dir}")
-                munch_sheet_path = munch_assets_dir / "non_standard_spritesheet.png"
-                save_and_compress_png(combined, munch_sheet_path, f"Munch non-standard spritesheet (combined)")
+                munch_copies.append((sheet_path, munch_assets_dir / "non_standard_spritesheet.png", digest,
+                                     f"Munch non-standard spritesheet (combined)"))
 
     if not munch_assets_dir.exists():
         print(f"\n⚠ Munch directory not found, skipping copy: {munch_assets_dir}")
 
+    if saved_pngs:
+        print(f"\nCompressing {len(saved_pngs)} spritesheet(s) with oxipng...")
+        compressed = run_oxipng(list(saved_pngs))
+
+        # Remember what was compressed; rewritten files that oxipng missed must be compressed next run
+        for path, (digest, pixels) in saved_pngs.items():
+            if compressed:
+                oxipng_cache[cache_key(path)] = cache_entry(path, digest)
+            else:
+                oxipng_cache.pop(cache_key(path), None)
+                # Level-1 files were only meant as oxipng input; don't leave them as the final output
+                if compress_level != DEFAULT_COMPRESS_LEVEL:
+                    Image.fromarray(pixels).save(path, "PNG", compress_level=DEFAULT_COMPRESS_LEVEL)
+                    print(f"  ↺ Re-saved {path.name} at the default compression level")
+
+    # The munch sheets are byte-identical, so copy the compressed outputs instead of encoding them again
+    if munch_copies:
+        print(f"\n📋 Copying to munch repository: {munch_assets_dir}")
+    for source_path, munch_sheet_path, digest, description in munch_copies:
+        output_digests[munch_sheet_path] = digest
+        if is_cached(oxipng_cache, munch_sheet_path, digest):
+            print(f"✅ {description} unchanged, skipping: {munch_sheet_path}")
+            continue
+        shutil.copyfile(source_path, munch_sheet_path)
+        print(f"✅ {description} copied -> {munch_sheet_path}")
+        if is_cached(oxipng_cache, source_path, digest):
+            oxipng_cache[cache_key(munch_sheet_path)] = cache_entry(munch_sheet_path, digest)
+        else:
+            oxipng_cache.pop(cache_key(munch_sheet_path), None)
+
+    # Only track this run's outputs, so a stale entry (e.g. from a removed munch checkout) can't block later skips
+    oxipng_cache = {
+        cache_key(path): oxipng_cache[cache_key(path)] for path in output_digests if cache_key(path) in oxipng_cache
+    }
+    if oxipng_cache != loaded_oxipng_cache:
+        oxipng_cache_path.write_text(json.dumps(oxipng_cache, indent=2, sort_keys=True) + "\n")
+
     # Save JSON files separately
     if standard_metadata:
         standard_json_path.write_text(compact_json(standard_metadata))
@@ -426,6 +673,41 @@ def create_attack_spritesheets(png_files: list[tuple[str, int, int, tuple[int, i
         non_standard_json_path.write_text(compact_json(non_standard_metadata))
         print(f"✅ Non-standard metadata saved to: {non_standard_json_path}")
 
+    # Release the decoded sources
+    load_sheet.cache_clear()
+
+    return all(is_cached(oxipng_cache, path, digest) for path, digest in output_digests.items())
+
+
+def run_fingerprint(target_dir: str) -> str:
+    """Fingerprint the (name, mtime, size) of every input and output file, plus this script.
+
+    Covers the PNG and JSON files in target_dir (sources and generated sheets alike) and the munch copies,
+    so editing, adding or deleting any of them, or changing the script, forces a full run.
+    """
+    stats = []
+    for directory in (Path(target_dir), MUNCH_ASSETS_DIR):
+        if not directory.is_dir():
+            stats.append((str(directory), None, None))
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith((".png", ".json")) and not entry.name.startswith(".") and entry.is_file():
+                    stat = entry.stat()
+                    stats.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    script = Path(__file__).stat()
+    stats.append((__file__, script.st_mtime_ns, script.st_size))
+    return hashlib.blake2b(json.dumps(sorted(stats, key=str)).encode(), digest_size=16).hexdigest()
+
+
+def outputs_intact(target_dir: str) -> bool:
+    """True if every spritesheet recorded in the oxipng cache is still the file this script wrote."""
+    oxipng_cache = load_oxipng_cache(Path(target_dir) / OXIPNG_CACHE_FILE)
+    return bool(oxipng_cache) and all(
+        isinstance(entry, dict) and is_cached(oxipng_cache, Path(path), entry.get("digest"))
+        for path, entry in oxipng_cache.items()
+    )
+
 
 def run(target_dir: str = None) -> bool:
     """
@@ -441,6 +723,16 @@ def run(target_dir: str = None) -> bool:
         print(f"Error: Directory '{target_dir}' does not exist")
         return False
 
+    fingerprint_path = Path(target_dir) / FINGERPRINT_FILE
+    try:
+        # The fingerprint already covers the outputs; re-checking them against the oxipng cache makes sure a
+        # sheet changed by hand is always regenerated, even if the fingerprint was somehow left matching
+        if fingerprint_path.read_text() == run_fingerprint(target_dir) and outputs_intact(target_dir):
+            print(f"Attack spritesheets in {target_dir} are up to date, skipping")
+            return True
+    except OSError:
+        pass
+
     print(f"Searching for attack PNG files in: {target_dir}\n")
     png_files = find_valid_attack_pngs(target_dir)
 
@@ -449,16 +741,22 @@ def run(target_dir: str = None) -> bool:
         return False
 
     print(f"\nFound {len(png_files)} valid PNG files:")
-    for png_path, cols, rows, source_size, output_size in png_files:
-        source_w, source_h = source_size
-        output_w, output_h = output_size
-        if source_size != output_size:
+    for spec in png_files:
+        source_w, source_h = spec.source_size
+        output_w, output_h = spec.output_size
+        if spec.source_size != spec.output_size:
             size_info = f"{source_w}x{source_h}→{output_w}x{output_h}"
         else:
             size_info = f"{output_w}x{output_h}"
-        print(f"  - {Path(png_path).name} ({cols}x{rows} = {cols * rows} frames @ {size_info})")
-
-    create_attack_spritesheets(png_files, target_dir)
+        print(f"  - {Path(spec.path).name} ({spec.cols}x{spec.rows} = {spec.cols * spec.rows} frames @ {size_info})")
+
+    # A run that fails part-way must not leave an old fingerprint that matches again later
+    fingerprint_path.unlink(missing_ok=True)
+    if create_attack_spritesheets(png_files, target_dir):
+        # Fingerprint after the outputs are written, so the next run sees exactly what this one left behind
+        fingerprint_path.write_text(run_fingerprint(target_dir))
+    else:
+        print("\n⚠ Some spritesheets are not compressed; the next run will build them again")
     print("\n✅ Done!")
     return True
 
@@ -4,27 +4,114 @@ Script to combine mons.csv, moves.csv, and abilities.csv into a TypeScript const
 """
 
 import csv
+import functools
+import itertools
 import json
+import operator
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
-
-
+from typing import Dict, Iterator, List, Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the stdlib encoder
+    orjson = None
+
+# Runs of non-alphanumeric characters (including underscores) collapse to a single "_"
+_NON_ALNUM_RUN = re.compile(r"[^a-zA-Z0-9]+")
+
+# String values emitted as TypeScript enum references
+ENUM_REPLACEMENTS = {
+    "Type": ["Yin", "Yang", "Earth", "Liquid", "Fire", "Metal", "Ice",
+             "Nature", "Lightning", "Mythic", "Air", "Math", "Cyber", "Wild", "Cosmic"],
+    "MoveClass": ["Physical", "Special", "Other", "Self"],
+}
+_ENUM_MAP = {val: f"{enum_name}.{val}" for enum_name, values in ENUM_REPLACEMENTS.items() for val in values}
+
+# Address string references and enum string values, rewritten in one pass
+_REFERENCE_RE = re.compile(
+    r'"Address\.(?P<address>[A-Z0-9_]+)"|"(?P<enum>' + "|".join(map(re.escape, _ENUM_MAP)) + r')"'
+)
+
+# Key order of every emitted sprite config
+_SPRITE_CONFIG_PROTO = {
+    "spritesheetUrl": None,
+    "frames": None,
+    "frameWidth": 96,
+    "frameHeight": 96,
+    "frameDurationMs": 100,
+    "loop": False,
+}
+
+MON_SPRITESHEET_URL = "/assets/mons/all/mon_spritesheet.png"
+MON_SWITCH_URL = "/assets/mons/all/mon_switch.png"
+
+# Sprite variants per side: (output_key, data_key, spritesheet_url, loops)
+SPRITE_VARIANTS = {
+    "front": (
+        ("frontIdle", None, MON_SPRITESHEET_URL, True),
+        ("frontSwitchIn", "switchIn", MON_SWITCH_URL, False),
+        ("frontSwitchOut", "switchOut", MON_SWITCH_URL, False),
+    ),
+    "back": (
+        ("backIdle", None, MON_SPRITESHEET_URL, True),
+        ("backSwitchIn", "switchIn", MON_SWITCH_URL, False),
+        ("backSwitchOut", "switchOut", MON_SWITCH_URL, False),
+    ),
+}
+
+# Output stat key -> mons.csv column
+STAT_COLUMNS = {
+    "hp": "HP",
+    "attack": "Attack",
+    "defense": "Defense",
+    "specialAttack": "SpecialAttack",
+    "specialDefense": "SpecialDefense",
+    "speed": "Speed",
+    "bst": "BST",
+}
+
+# Numeric moves.csv columns that may contain '?'
+MOVE_NUMERIC_COLUMNS = ("Power", "Stamina", "Accuracy", "Priority")
+
+# "frames": followed by a multi-line array of coordinate pairs
+_FRAMES_RE = re.compile(r'"frames": (\[\s*\[[\d\s,\[\]]+\])')
+
+# Shared placeholder for mons without an ability row (read-only, never mutated)
+_DEFAULT_ABILITY = {"address": "", "name": "", "effect": ""}
+
+
+@functools.lru_cache(maxsize=4096)
 def to_address_key(name: str) -> str:
     """Convert name to UPPER_SNAKE_CASE for address key."""
-    return re.sub(r"_+", "_", re.sub(r"[^a-zA-Z0-9]", "_", name)).strip("_").upper()
+    return _NON_ALNUM_RUN.sub("_", name).strip("_").upper()
+
+
+@functools.lru_cache(maxsize=4096)
+def to_address_ref(name: str) -> str:
+    """Convert name to an `Address.KEY` reference string."""
+    return f"Address.{to_address_key(name)}"
 
 
 def to_spritesheet_key(name: str) -> str:
     """Convert name to lowercase_snake_case for spritesheet key."""
-    return re.sub(r"_+", "_", re.sub(r"[^a-zA-Z0-9]", "_", name)).strip("_").lower()
+    return _NON_ALNUM_RUN.sub("_", name).strip("_").lower()
 
 
-def read_csv(file_path: str) -> List[Dict[str, str]]:
-    """Read a CSV file and return list of row dicts."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+def read_csv(file_path: str) -> tuple[Dict[str, int], List[List[str]]]:
+    """Read a CSV file and return a column-name -> index map plus the data rows."""
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return {name: i for i, name in enumerate(header)}, list(reader)
+
+
+def encode_json(data: Any) -> str:
+    """Encode data as 2-space indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
 
 def read_json(file_path: str) -> Dict[str, Any]:
@@ -41,14 +128,15 @@ def build_sprite_config(
     loop: bool,
 ) -> Dict[str, Any]:
     """Build a sprite animation config from source data."""
-    return {
-        "spritesheetUrl": spritesheet_url,
-        "frames": source["frames"],
-        "frameWidth": frame_width,
-        "frameHeight": frame_height,
-        "frameDurationMs": source.get("msPerFrame", 100),
-        "loop": loop,
-    }
+    # Copying a fixed-key prototype avoids rehashing the keys for every config
+    config = _SPRITE_CONFIG_PROTO.copy()
+    config["spritesheetUrl"] = spritesheet_url
+    config["frames"] = source["frames"]
+    config["frameWidth"] = frame_width
+    config["frameHeight"] = frame_height
+    config["frameDurationMs"] = source.get("msPerFrame", 100)
+    config["loop"] = loop
+    return config
 
 
 def build_attack_sprite(
@@ -84,68 +172,64 @@ def build_attack_sprite(
     return None
 
 
-def build_sprites(mon_name_lower: str, spritesheet_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Build sprite configurations for a mon."""
+def build_sprites(front_key: str, back_key: str, spritesheet_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build sprite configurations for a mon from its front/back spritesheet keys."""
     sprites = {}
     
-    # Define sprite variants: (side, output_key, data_key, spritesheet, loops)
-    SPRITE_VARIANTS = [
-        ("front", "frontIdle", None, "mon_spritesheet.png", True),
-        ("front", "frontSwitchIn", "switchIn", "mon_switch.png", False),
-        ("front", "frontSwitchOut", "switchOut", "mon_switch.png", False),
-        ("back", "backIdle", None, "mon_spritesheet.png", True),
-        ("back", "backSwitchIn", "switchIn", "mon_switch.png", False),
-        ("back", "backSwitchOut", "switchOut", "mon_switch.png", False),
-    ]
-    
-    for side, output_key, data_key, sheet, loops in SPRITE_VARIANTS:
-        side_data = spritesheet_data.get(f"{mon_name_lower}_{side}.gif", {})
+    for side_key, variants in ((front_key, SPRITE_VARIANTS["front"]), (back_key, SPRITE_VARIANTS["back"])):
+        side_data = spritesheet_data.get(side_key)
         if not side_data:
             continue
             
-        # For idle animations, use root-level frames; for switch animations, use nested data
-        source = side_data if data_key is None else side_data.get(data_key, {})
-        if not source or "frames" not in source:
-            continue
-            
-        sprites[output_key] = build_sprite_config(
-            f"/assets/mons/all/{sheet}",
-            source,
-            frame_width=96,
-            frame_height=96,
-            loop=loops,
-        )
+        for output_key, data_key, spritesheet_url, loops in variants:
+            # For idle animations, use root-level frames; for switch animations, use nested data
+            source = side_data if data_key is None else side_data.get(data_key)
+            if not source or "frames" not in source:
+                continue
+                
+            sprites[output_key] = build_sprite_config(
+                spritesheet_url,
+                source,
+                frame_width=96,
+                frame_height=96,
+                loop=loops,
+            )
     
     return sprites
 
 
-def read_mons_data(file_path: str, spritesheet_data: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
-    """Read mons.csv and return a dictionary keyed by mon ID."""
+def read_mons_data(
+    file_path: str,
+    spritesheet_data: Dict[str, Any],
+    moves_by_mon: Dict[str, List[Dict[str, Any]]],
+    abilities_by_mon: Dict[str, Dict[str, str]],
+) -> Dict[int, Dict[str, Any]]:
+    """Read mons.csv and return a dictionary keyed by mon ID, with moves and ability attached."""
     mons_data = {}
+    idx, rows = read_csv(file_path)
+    i_id, i_name, i_flavor = idx["Id"], idx["Name"], idx.get("Flavor")
+    get_stats = operator.itemgetter(*(idx[col] for col in STAT_COLUMNS.values()))
+    i_type1, i_type2 = idx["Type1"], idx["Type2"]
     
-    for row in read_csv(file_path):
-        mon_id = int(row["Id"])
-        mon_name_lower = row["Name"].lower()
+    for row in rows:
+        mon_id = int(row[i_id])
+        # Interned so lookups into moves_by_mon / abilities_by_mon hit the identity fast path
+        mon_name = sys.intern(row[i_name])
+        mon_name_lower = mon_name.lower()
+        type2 = row[i_type2]
         
         mons_data[mon_id] = {
             "id": mon_id,
-            "name": row["Name"],
-            "flavor": row.get("Flavor", ""),
-            "mini": f"/assets/mons/all/{mon_name_lower}_mini.gif",
-            "sprites": build_sprites(mon_name_lower, spritesheet_data),
-            "stats": {
-                "hp": int(row["HP"]),
-                "attack": int(row["Attack"]),
-                "defense": int(row["Defense"]),
-                "specialAttack": int(row["SpecialAttack"]),
-                "specialDefense": int(row["SpecialDefense"]),
-                "speed": int(row["Speed"]),
-                "bst": int(row["BST"]),
-            },
-            "type1": row["Type1"],
-            "type2": row["Type2"] if row["Type2"] != "NA" else None,
-            "moves": [],
-            "ability": {"address": "", "name": "", "effect": ""},
+            "name": mon_name,
+            # Flavor is the last column, so rows that leave it off are short
+            "flavor": row[i_flavor] if i_flavor is not None and i_flavor < len(row) else "",
+            "mini": "/assets/mons/all/" + mon_name_lower + "_mini.gif",
+            "sprites": build_sprites(mon_name_lower + "_front.gif", mon_name_lower + "_back.gif", spritesheet_data),
+            "stats": dict(zip(STAT_COLUMNS, map(int, get_stats(row)))),
+            "type1": sys.intern(row[i_type1]),
+            "type2": sys.intern(type2) if type2 != "NA" else None,
+            "moves": moves_by_mon.get(mon_name, []),
+            "ability": abilities_by_mon.get(mon_name, _DEFAULT_ABILITY),
         }
     
     return mons_data
@@ -157,34 +241,49 @@ def read_moves_data(
     non_standard_spritesheet_data: Dict[str, Any]
 ) -> tuple[Dict[str, List[Dict[str, Any]]], set[str]]:
     """Read moves.csv and return a dictionary keyed by mon name, plus set of all move keys."""
-    moves_by_mon: Dict[str, List[Dict[str, Any]]] = {}
     all_move_keys: set[str] = set()
 
     def parse_int_or_unknown(val: str) -> int | str:
-        return int(val) if val.isdigit() else '?'
-
-    for row in read_csv(file_path):
-        mon_name = row["Mon"]
-        move_name = row["Name"]
+        try:
+            return int(val)
+        except ValueError:
+            return '?'
+
+    idx, rows = read_csv(file_path)
+    i_name, i_mon = idx["Name"], idx["Mon"]
+    get_numeric = operator.itemgetter(*(idx[col] for col in MOVE_NUMERIC_COLUMNS))
+    i_type, i_class, i_desc, i_extra = idx["Type"], idx["Class"], idx["DevDescription"], idx["ExtraData"]
+
+    def build_move(row: List[str]) -> Dict[str, Any]:
+        move_name = row[i_name]
         move_key = to_spritesheet_key(move_name)
         all_move_keys.add(move_key)
+        power, stamina, accuracy, priority = map(parse_int_or_unknown, get_numeric(row))
 
         move_data: Dict[str, Any] = {
-            "address": f"Address.{to_address_key(move_name)}",
+            "address": to_address_ref(move_name),
             "name": move_name,
-            "power": parse_int_or_unknown(row["Power"]),
-            "stamina": parse_int_or_unknown(row["Stamina"]),
-            "accuracy": parse_int_or_unknown(row["Accuracy"]),
-            "priority": parse_int_or_unknown(row["Priority"]),
-            "type": row["Type"],
-            "class": row["Class"],
-            "description": row["DevDescription"],
-            "extraDataNeeded": row["ExtraData"] == "Yes",
+            "power": power,
+            "stamina": stamina,
+            "accuracy": accuracy,
+            "priority": priority,
+            "type": sys.intern(row[i_type]),
+            "class": sys.intern(row[i_class]),
+            "description": row[i_desc],
+            "extraDataNeeded": row[i_extra] == "Yes",
         }
         sprite = build_attack_sprite(move_name, attack_spritesheet_data, non_standard_spritesheet_data)
         if sprite:
             move_data["sprite"] = sprite
-        moves_by_mon.setdefault(mon_name, []).append(move_data)
+        return move_data
+
+    # Group rows by mon; the sort is stable, so each mon keeps its CSV move order
+    get_mon = operator.itemgetter(i_mon)
+    rows.sort(key=get_mon)
+    moves_by_mon = {
+        sys.intern(mon_name): [build_move(row) for row in group]
+        for mon_name, group in itertools.groupby(rows, key=get_mon)
+    }
 
     return moves_by_mon, all_move_keys
 
@@ -224,87 +323,47 @@ def find_non_standard_sprites(
 
 def read_abilities_data(file_path: str) -> Dict[str, Dict[str, str]]:
     """Read abilities.csv and return a dictionary keyed by mon name."""
+    idx, rows = read_csv(file_path)
+    i_name, i_mon, i_effect = idx["Name"], idx["Mon"], idx["Effect"]
     return {
-        row["Mon"]: {
-            "address": f"Address.{to_address_key(row['Name'])}",
-            "name": row["Name"],
-            "effect": row["Effect"],
+        sys.intern(row[i_mon]): {
+            "address": to_address_ref(row[i_name]),
+            "name": row[i_name],
+            "effect": row[i_effect],
         }
-        for row in read_csv(file_path)
+        for row in rows
     }
 
 
-def combine_data(
-    mons_data: Dict[int, Dict[str, Any]],
-    moves_by_mon: Dict[str, List[Dict[str, Any]]],
-    abilities_by_mon: Dict[str, Dict[str, str]],
-) -> Dict[int, Dict[str, Any]]:
-    """Combine all data sources into a single structure."""
-    for mon_data in mons_data.values():
-        mon_name = mon_data["name"]
-        mon_data["moves"] = moves_by_mon.get(mon_name, [])
-        mon_data["ability"] = abilities_by_mon.get(mon_name, mon_data["ability"])
-    return mons_data
+def _collapse_frames_match(m: re.Match) -> str:
+    # Frame arrays hold only digits, commas, brackets and whitespace, so normalizing
+    # whitespace with split/join and tightening the brackets needs no regex
+    collapsed = " ".join(m.group(1).split()).replace("[ ", "[").replace(" ]", "]")
+    return f'"frames": {collapsed}'
 
 
 def collapse_frame_arrays(json_str: str) -> str:
     """Collapse frame arrays like [[0,0], [96,0]] back to single lines."""
-    # Match "frames": followed by a multi-line array of coordinate pairs
-    def collapse_match(m: re.Match) -> str:
-        content = m.group(1)
-        # Remove newlines and excess whitespace, normalize to compact format
-        collapsed = re.sub(r"\s+", " ", content).strip()
-        # Clean up spacing around brackets
-        collapsed = re.sub(r"\[ +", "[", collapsed)
-        collapsed = re.sub(r" +\]", "]", collapsed)
-        return f'"frames": {collapsed}'
-    
-    return re.sub(
-        r'"frames": (\[\s*\[[\d\s,\[\]]+\])',
-        collapse_match,
-        json_str,
-        flags=re.MULTILINE
-    )
-
+    return _FRAMES_RE.sub(_collapse_frames_match, json_str)
 
-def generate_typescript_const(data: Dict[int, Dict[str, Any]], output_file: str):
-    """Generate TypeScript const declaration and write to file."""
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    
-    # Collapse frame arrays to single lines
-    json_str = collapse_frame_arrays(json_str)
-    
-    # Replace string keys with integer keys
-    json_str = re.sub(r'"(\d+)":', r"\1:", json_str)
-    
-    # Replace address string references with Address object references
-    json_str = re.sub(r'"Address\.([A-Z0-9_]+)"', r"Address.\1", json_str)
-    
-    # Replace string values with enum references
-    ENUM_REPLACEMENTS = {
-        "Type": ["Yin", "Yang", "Earth", "Liquid", "Fire", "Metal", "Ice", 
-                 "Nature", "Lightning", "Mythic", "Air", "Math", "Cyber", "Wild", "Cosmic"],
-        "MoveClass": ["Physical", "Special", "Other", "Self"],
-    }
-    for enum_name, values in ENUM_REPLACEMENTS.items():
-        for val in values:
-            json_str = json_str.replace(f'"{val}"', f"{enum_name}.{val}")
 
-    typescript_content = f"""// Auto-generated type file
-import {{ Address }} from './address';
-import {{ LowercaseHex, Type }} from '../types/structs';
-import {{ SpriteAnimationConfig }} from '../types/animation';
+MON_TS_HEADER = """// Auto-generated type file
+import { Address } from './address';
+import { LowercaseHex, Type } from '../types/structs';
+import { SpriteAnimationConfig } from '../types/animation';
 
-export enum MoveClass {{
+export enum MoveClass {
   Physical = 'Physical',
   Special = 'Special',
   Other = 'Other',
   Self = 'Self',
-}};
+};
 
-export const MonMetadata = {json_str} as const;
+export const MonMetadata = """.encode("utf-8")
 
-export type Move = {{
+MON_TS_FOOTER = """ as const;
+
+export type Move = {
   readonly address: LowercaseHex;
   readonly name: string;
   readonly power: number | '?';
@@ -316,22 +375,22 @@ export type Move = {{
   readonly description: string;
   readonly extraDataNeeded: boolean;
   readonly sprite?: SpriteAnimationConfig;
-}};
+};
 
-export type Mon = {{
+export type Mon = {
   readonly id: number;
   readonly name: string;
   readonly flavor: string;
   readonly mini: string;
-  readonly sprites: {{
+  readonly sprites: {
     readonly frontIdle: SpriteAnimationConfig;
     readonly frontSwitchIn: SpriteAnimationConfig;
     readonly frontSwitchOut: SpriteAnimationConfig;
     readonly backIdle: SpriteAnimationConfig;
     readonly backSwitchIn: SpriteAnimationConfig;
     readonly backSwitchOut: SpriteAnimationConfig;
-  }};
-  readonly stats: {{
+  };
+  readonly stats: {
     readonly hp: number;
     readonly attack: number;
     readonly defense: number;
@@ -339,27 +398,66 @@ export type Mon = {{
     readonly specialDefense: number;
     readonly speed: number;
     readonly bst: number;
-  }};
+  };
   readonly type1: Type;
   readonly type2: Type | null;
   readonly moves: readonly [Move, Move, Move, Move, ...Array<Move>];
-  readonly ability: {{
+  readonly ability: {
     readonly address: LowercaseHex;
     readonly name: string;
     readonly effect: string;
-  }};
-}};
+  };
+};
 
 export type MonDatabase = Record<number, Mon>;
-"""
+""".encode("utf-8")
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(typescript_content)
+
+def _replace_reference(m: re.Match) -> str:
+    if m.lastgroup == "address":
+        return f"Address.{m.group('address')}"
+    return _ENUM_MAP[m.group("enum")]
+
+
+def postprocess_json(json_str: str) -> str:
+    """Rewrite serialized JSON into TypeScript literal syntax."""
+    # Collapse frame arrays to single lines
+    json_str = collapse_frame_arrays(json_str)
+    
+    # Replace address strings with Address object references and string values with enum references
+    return _REFERENCE_RE.sub(_replace_reference, json_str)
+
+
+def iter_typescript_const(data: Dict[int, Dict[str, Any]]) -> Iterator[bytes]:
+    """Yield the encoded TypeScript const file chunk by chunk.
+
+    Each mon entry is encoded and post-processed on its own, so the full
+    serialized dataset is never held in memory at once.
+    """
+    yield MON_TS_HEADER
+    if not data:
+        yield b"{}"
+    else:
+        separator = "{\n  "
+        for mon_id, mon_data in data.items():
+            # Nest the entry one level deep, matching json.dumps(data, indent=2)
+            entry = encode_json(mon_data).replace("\n", "\n  ")
+            # Mon IDs are written as bare integer keys
+            yield f"{separator}{mon_id}: {postprocess_json(entry)}".encode("utf-8")
+            separator = ",\n  "
+        yield b"\n}"
+    yield MON_TS_FOOTER
+
+
+def generate_typescript_const(data: Dict[int, Dict[str, Any]], output_file: str):
+    """Generate TypeScript const declaration and write to file."""
+    with open(output_file, "wb", buffering=1 << 20) as f:
+        f.writelines(iter_typescript_const(data))
 
 
 def generate_non_standard_sprites_file(sprites: Dict[str, Dict[str, Any]], output_file: str):
     """Generate TypeScript file for non-standard attack sprites not matched to any mon's moves."""
-    json_str = json.dumps(sprites, indent=2, ensure_ascii=False)
+    json_str = encode_json(sprites)
 
     # Collapse frame arrays to single lines
     json_str = collapse_frame_arrays(json_str)
@@ -413,14 +511,13 @@ def run() -> bool:
         non_standard_spritesheet_data = read_json(str(files["non_standard_spritesheet"]))
         print(f"  ✓ Loaded non-standard attack spritesheet")
 
-    mons_data = read_mons_data(str(files["mons"]), spritesheet_data)
     moves_by_mon, all_move_keys = read_moves_data(str(files["moves"]), attack_spritesheet_data, non_standard_spritesheet_data)
     abilities_by_mon = read_abilities_data(str(files["abilities"]))
+    mons_data = read_mons_data(str(files["mons"]), spritesheet_data, moves_by_mon, abilities_by_mon)
 
     print(f"Loaded {len(mons_data)} mons, moves for {len(moves_by_mon)} mons, abilities for {len(abilities_by_mon)} mons")
 
-    combined_data = combine_data(mons_data, moves_by_mon, abilities_by_mon)
-    generate_typescript_const(combined_data, str(output_file))
+    generate_typescript_const(mons_data, str(output_file))
     print(f"✅ Generated TypeScript const in {output_file}")
 
     # Find and generate non-standard sprites not matched to any mon's moves